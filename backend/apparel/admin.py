@@ -1,10 +1,34 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.utils.html import format_html
 from .models import ApparelProduct, Order
 
 
+class ProjectedChangeList(ChangeList):
+    """Changelist that only selects the columns the list page renders."""
+    
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        return queryset.only(*self.model_admin.list_only_fields)
+
+
+class ProjectedListMixin:
+    """
+    Restrict changelist queries to ``list_only_fields``.
+    
+    The change form still loads the full row; only the list page is narrowed.
+    """
+    
+    list_only_fields = ()
+    list_per_page = 50
+    show_full_result_count = False
+    
+    def get_changelist(self, request, **kwargs):
+        return ProjectedChangeList
+
+
 @admin.register(ApparelProduct)
-class ApparelProductAdmin(admin.ModelAdmin):
+class ApparelProductAdmin(ProjectedListMixin, admin.ModelAdmin):
     """Admin interface for Apparel Products."""
     
     list_display = [
@@ -17,6 +41,18 @@ class ApparelProductAdmin(admin.ModelAdmin):
         'created_at',
     ]
     
+    # Columns needed by list_display (image backs image_thumbnail)
+    list_only_fields = (
+        'id',
+        'image',
+        'title',
+        'category',
+        'mrp_price',
+        'status',
+        'is_active',
+        'created_at',
+    )
+    
     list_filter = [
         'category',
         'status',
@@ -60,7 +96,7 @@ class ApparelProductAdmin(admin.ModelAdmin):
     def image_thumbnail(self, obj):
         """Display small thumbnail in list view."""
         if obj and obj.image:
-            return format_html('<img src="{}" width="50" height="50" style="object-fit: cover; border-radius: 4px;" />', obj.image.url)
+            return format_html('<img src="{}" width="50" height="50" style="object-fit: cover; border-radius: 4px;" />', obj.get_thumbnail_url(100))
         return '-'
     image_thumbnail.short_description = 'Image'
     
@@ -79,7 +115,7 @@ class ApparelProductAdmin(admin.ModelAdmin):
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(ProjectedListMixin, admin.ModelAdmin):
     """Admin interface for Orders."""
     
     list_display = [
@@ -94,6 +130,19 @@ class OrderAdmin(admin.ModelAdmin):
         'created_at',
     ]
     
+    list_only_fields = (
+        'id',
+        'order_id',
+        'product_title',
+        'full_name',
+        'mobile',
+        'total_amount',
+        'payment_mode',
+        'payment_status',
+        'order_status',
+        'created_at',
+    )
+    
     list_filter = [
         'payment_mode',
         'payment_status',
@@ -101,13 +150,16 @@ class OrderAdmin(admin.ModelAdmin):
         'created_at',
     ]
     
+    # Case-sensitive exact/prefix lookups compile to "= q" and "LIKE 'q%'",
+    # which can use the column indexes; the i* variants behind '=' and '^'
+    # wrap the column in UPPER() on PostgreSQL and can't.
     search_fields = [
-        'order_id',
+        'order_id__exact',
+        'razorpay_order_id__startswith',
+        'razorpay_payment_id__startswith',
+        'mobile__startswith',
         'product_title',
         'full_name',
-        'mobile',
-        'razorpay_order_id',
-        'razorpay_payment_id',
     ]
     
     readonly_fields = [
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher
 from decouple import config
 
 
@@ -9,9 +10,14 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         User = get_user_model()
         
-        username = config('DJANGO_SUPERUSER_USERNAME', default='admin')
+        # Normalized the same way create_superuser() will store it
+        username = User.normalize_username(
+            config('DJANGO_SUPERUSER_USERNAME', default='admin')
+        )
         email = config('DJANGO_SUPERUSER_EMAIL', default='admin@jbsevents.com')
         password = config('DJANGO_SUPERUSER_PASSWORD', default='changeme123')
+        # Optional pre-computed hash (from make_password) to skip PBKDF2 at boot
+        password_hash = config('DJANGO_SUPERUSER_PASSWORD_HASH', default=None)
         
         if User.objects.filter(username=username).exists():
             self.stdout.write(
@@ -20,11 +26,16 @@ class Command(BaseCommand):
             return
         
         try:
-            User.objects.create_superuser(
-                username=username,
-                email=email,
-                password=password
-            )
+            if password_hash:
+                identify_hasher(password_hash)  # Reject values that aren't Django hashes
+            
+            # password=None stores an unusable password, so no hashing happens here
+            user = User.objects.create_superuser(username, email, password=None)
+            if password_hash:
+                user.password = password_hash
+            else:
+                user.set_password(password)
+            user.save(update_fields=['password'])
             self.stdout.write(
                 self.style.SUCCESS(f'Superuser "{username}" created successfully!')
             )
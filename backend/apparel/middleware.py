@@ -0,0 +1,22 @@
+from django.http import HttpResponse
+
+
+HEALTH_CHECK_PATHS = frozenset({'/health', '/ready'})
+
+
+class HealthFastPathMiddleware:
+    """
+    Answer load-balancer health probes before the rest of the stack runs.
+    
+    Render hits the health check every few seconds; it only needs to know
+    the worker is up, so it skips host validation, sessions, CORS and the
+    URL resolver entirely. Must be first in MIDDLEWARE.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        if request.path in HEALTH_CHECK_PATHS:
+            return HttpResponse(b'ok', content_type='text/plain')
+        return self.get_response(request)
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-14 10:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apparel', '0003_order'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='mobile',
+            field=models.CharField(db_index=True, help_text='Customer mobile number', max_length=15),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='razorpay_order_id',
+            field=models.CharField(blank=True, db_index=True, help_text='Razorpay order ID', max_length=100, null=True),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='razorpay_payment_id',
+            field=models.CharField(blank=True, db_index=True, help_text='Razorpay payment ID', max_length=100, null=True),
+        ),
+    ]
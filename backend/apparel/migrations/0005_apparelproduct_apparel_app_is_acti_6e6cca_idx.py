@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-14 11:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apparel', '0004_alter_order_mobile_alter_order_razorpay_order_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apparelproduct',
+            index=models.Index(fields=['is_active', 'category'], name='apparel_app_is_acti_6e6cca_idx'),
+        ),
+    ]
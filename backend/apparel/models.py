@@ -1,6 +1,10 @@
 from django.db import models
 from django.core.validators import MinValueValidator
+from cloudinary_storage.storage import MediaCloudinaryStorage
+import cloudinary
 import os
+import secrets
+import time
 
 
 def apparel_image_upload_path(instance, filename):
@@ -12,6 +16,16 @@ def apparel_image_upload_path(instance, filename):
     return os.path.join('apparel', new_filename)
 
 
+def generate_order_id():
+    """
+    Generate a compact, time-ordered order ID.
+    
+    A millisecond timestamp followed by 24 random bits, so a collision needs
+    two orders in the same millisecond drawing the same suffix.
+    """
+    return f"ORD{time.time_ns() // 1_000_000:011X}{secrets.randbits(24):06X}"
+
+
 class ApparelProduct(models.Model):
     """Model for apparel products."""
     
@@ -90,6 +104,10 @@ class ApparelProduct(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Apparel Product'
         verbose_name_plural = 'Apparel Products'
+        indexes = [
+            # Product list filters on is_active and optionally category
+            models.Index(fields=['is_active', 'category']),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.get_category_display()})"
@@ -102,6 +120,25 @@ class ApparelProduct(models.Model):
         }
         return color_map.get(self.status, 'bg-gray-500')
     
+    def get_thumbnail_url(self, size):
+        """
+        Get URL for a square thumbnail of the product image.
+        
+        On Cloudinary the resize is done by the CDN, so list pages download a
+        few KB per row instead of the full upload.
+        """
+        storage = self.image.storage
+        if isinstance(storage, MediaCloudinaryStorage):
+            # Resolve the public_id the same way storage.url() does, so the
+            # thumbnail and the full image always point at the same asset.
+            # These are private storage helpers; requirements.txt pins
+            # django-cloudinary-storage/cloudinary to the versions checked.
+            name = storage._prepend_prefix(self.image.name)
+            return cloudinary.CloudinaryResource(
+                name, default_resource_type=storage._get_resource_type(name)
+            ).build_url(width=size, height=size, crop='fill', quality='auto')
+        return self.image.url
+    
     def save(self, *args, **kwargs):
         """Override save to set default WhatsApp message."""
         # Set default WhatsApp message if not provided
@@ -173,6 +210,7 @@ class Order(models.Model):
     )
     mobile = models.CharField(
         max_length=15,
+        db_index=True,
         help_text="Customer mobile number"
     )
     country_code = models.CharField(
@@ -222,12 +260,14 @@ class Order(models.Model):
         max_length=100,
         blank=True,
         null=True,
+        db_index=True,
         help_text="Razorpay order ID"
     )
     razorpay_payment_id = models.CharField(
         max_length=100,
         blank=True,
         null=True,
+        db_index=True,
         help_text="Razorpay payment ID"
     )
     razorpay_signature = models.CharField(
@@ -266,7 +306,7 @@ class Order(models.Model):
         return f"Order {self.order_id} - {self.full_name}"
     
     def save(self, *args, **kwargs):
-        """Override save to calculate total amount."""
-        if not self.total_amount:
+        """Override save to calculate total amount when it wasn't provided."""
+        if self.total_amount is None:
             self.total_amount = self.price * self.quantity
         super().save(*args, **kwargs)
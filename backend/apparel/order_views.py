@@ -1,14 +1,18 @@
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from twilio.rest import Client
-from django.conf import settings
-from decouple import config
-from .models import Order
-from .payment_views import send_whatsapp_notification
-import os
-import uuid
+from .models import Order, generate_order_id
+from .payment_views import queue_whatsapp_notification
+import logging
 
+logger = logging.getLogger(__name__)
+
+# Fields a COD order must include, in the order they're reported when missing
+REQUIRED_ORDER_FIELDS = (
+    'product_title', 'size', 'quantity', 'price', 'full_name',
+    'mobile', 'country_code', 'pin_code', 'state', 'city',
+    'house_flat_no', 'street_locality',
+)
 
 @api_view(['POST'])
 def create_whatsapp_order(request):
@@ -29,19 +33,15 @@ def create_whatsapp_order(request):
             )
         
         # Validate required fields
-        required_fields = ['product_title', 'size', 'quantity', 'price', 'full_name', 
-                          'mobile', 'country_code', 'pin_code', 'state', 'city', 
-                          'house_flat_no', 'street_locality']
-        
-        for field in required_fields:
-            if not data.get(field):
-                return Response(
-                    {'error': f'Missing required field: {field}'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+        missing_fields = [field for field in REQUIRED_ORDER_FIELDS if not data.get(field)]
+        if missing_fields:
+            return Response(
+                {'error': f"Missing required field(s): {', '.join(missing_fields)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Generate unique order ID
-        order_id = f"ORD{uuid.uuid4().hex[:8].upper()}"
+        order_id = generate_order_id()
         
         # Calculate total price
         total_price = float(data['price']) * int(data['quantity'])
@@ -67,46 +67,19 @@ def create_whatsapp_order(request):
             order_status='CONFIRMED'
         )
         
-        # Send WhatsApp notification
-        try:
-            print(f"\n{'='*60}")
-            print(f"🔔 Attempting WhatsApp notification for Order: {order_id}")
-            print(f"{'='*60}")
-            whatsapp_message_sid = send_whatsapp_notification(order)
-            order.whatsapp_message_sid = whatsapp_message_sid
-            order.save()
-            print(f"✅ WhatsApp notification successful!")
-            print(f"{'='*60}\n")
-        except Exception as e:
-            error_msg = str(e)
-            print(f"\n{'='*60}")
-            print(f"❌ WhatsApp notification failed (non-critical)")
-            print(f"   Order ID: {order_id}")
-            print(f"   Error: {error_msg}")
-            print(f"{'='*60}\n")
-            import traceback
-            traceback.print_exc()
-            # Still create order but don't fail if WhatsApp fails
-            return Response({
-                'success': True,
-                'message': 'Order placed successfully!',
-                'order_id': order_id,
-                'warning': f'WhatsApp notification could not be sent: {error_msg}'
-            }, status=status.HTTP_201_CREATED)
-        
+        # Send WhatsApp notification in the background so the customer
+        # doesn't wait on the Twilio round-trip
+        queue_whatsapp_notification(order)
         
         # Return success response
         return Response({
             'success': True,
             'message': 'Order placed successfully! We will contact you shortly.',
             'order_id': order_id,
-            'whatsapp_message_sid': whatsapp_message_sid
         }, status=status.HTTP_201_CREATED)
         
     except Exception as e:
-        print(f"Error processing order: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error processing order")
         return Response(
             {'error': f'Failed to process order: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
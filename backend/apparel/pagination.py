@@ -0,0 +1,13 @@
+from rest_framework.pagination import CursorPagination
+
+
+class NewestFirstCursorPagination(CursorPagination):
+    """
+    Cursor pagination, newest rows first.
+    
+    Pages are fetched by seeking past the last id seen, so there is no
+    COUNT(*) over the table on every list request. Ordering by the primary
+    key keeps the cursor unique and index-backed.
+    """
+    
+    ordering = '-id'
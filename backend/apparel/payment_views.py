@@ -2,13 +2,154 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.conf import settings
+from django.db import connection, transaction
 from decouple import config
+from concurrent.futures import ThreadPoolExecutor
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 import razorpay
-import hmac
-import hashlib
-from .models import Order
+import requests
+from .models import Order, generate_order_id
+from requests.adapters import HTTPAdapter
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
-import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Razorpay credentials, read once at import
+RAZORPAY_KEY_ID = config('RAZORPAY_KEY_ID', default=None)
+RAZORPAY_KEY_SECRET = config('RAZORPAY_KEY_SECRET', default=None)
+
+# Largest checkout accepted, in paise (Rs 5,00,000); far above any real order
+MAX_AMOUNT_IN_PAISE = 50_000_000
+
+# Twilio credentials, read once at import
+TWILIO_ACCOUNT_SID = config('TWILIO_ACCOUNT_SID', default=None)
+TWILIO_AUTH_TOKEN = config('TWILIO_AUTH_TOKEN', default=None)
+TWILIO_WHATSAPP_FROM = config('TWILIO_WHATSAPP_FROM', default=None)
+TWILIO_WHATSAPP_TO = config('TWILIO_WHATSAPP_TO', default=None)
+
+# Connect/read timeout for each Twilio API call
+TWILIO_TIMEOUT_SECONDS = 10
+
+# Set WHATSAPP_ENABLED=False to switch notifications off (local/staging)
+WHATSAPP_ENABLED = bool(TWILIO_ACCOUNT_SID) and config('WHATSAPP_ENABLED', default=True, cast=bool)
+
+
+def _build_twilio_client():
+    """
+    Build the shared Twilio client.
+    
+    Its HTTP session is pooled so repeated sends reuse the TLS connection
+    to api.twilio.com instead of handshaking on every order.
+    """
+    if not WHATSAPP_ENABLED or not TWILIO_AUTH_TOKEN:
+        return None
+    
+    # Sends run on WHATSAPP_EXECUTOR threads, outside gunicorn's worker
+    # timeout, so a hung Twilio call must be bounded here
+    http_client = TwilioHttpClient(timeout=TWILIO_TIMEOUT_SECONDS)
+    http_client.session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
+    return Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, http_client=http_client)
+
+
+TWILIO_CLIENT = _build_twilio_client()
+
+
+def _build_razorpay_client():
+    """
+    Build the shared Razorpay client.
+    
+    Like the Twilio client, it runs on a pooled session so checkouts reuse
+    the TLS connection to api.razorpay.com.
+    """
+    if not all([RAZORPAY_KEY_ID, RAZORPAY_KEY_SECRET]):
+        return None
+    
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
+    return razorpay.Client(session=session, auth=(RAZORPAY_KEY_ID, RAZORPAY_KEY_SECRET))
+
+
+RAZORPAY_CLIENT = _build_razorpay_client()
+
+# WhatsApp order notification, filled in by send_whatsapp_notification
+WHATSAPP_TEMPLATE = """🛍️ *New Order Received!*
+
+📦 *Order Details:*
+• Order ID: {order_id}
+• Product: {product_title}
+• Size: {size}
+• Quantity: {quantity}
+• Total: ₹{total_amount:.2f}
+{payment_info}
+
+👤 *Customer Details:*
+• Name: {full_name}
+• Mobile: {country_code} {mobile}
+
+📍 *Delivery Address:*
+• House/Flat: {house_flat_no}
+• Street: {street_locality}
+• City: {city}
+• State: {state}
+• PIN Code: {pin_code}
+
+✅ Please process this order!"""
+
+PAYMENT_INFO_ONLINE = "💳 Payment: Online (PAID)"
+PAYMENT_INFO_COD = "💵 Payment: Cash on Delivery"
+
+# Background workers for WhatsApp sends, so order responses don't block on Twilio.
+# The queue lives in process memory: sends still queued when a worker restarts
+# are dropped (the order itself is already committed).
+WHATSAPP_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='whatsapp')
+
+
+# Fields every cart line item and the shared customer details must carry
+REQUIRED_ITEM_FIELDS = ('product_title', 'size', 'quantity', 'price')
+REQUIRED_CUSTOMER_FIELDS = (
+    'full_name', 'mobile', 'house_flat_no', 'street_locality',
+    'city', 'state', 'pin_code',
+)
+
+
+def _validate_order_data(order_data):
+    """
+    Check the cart sent to verify_payment.
+    
+    Returns (error, items, total_in_paise); error is None when the cart is
+    usable, otherwise a message for a 400 response.
+    """
+    if not isinstance(order_data, dict):
+        return 'order_data must be an object', None, None
+    
+    is_cart = bool(order_data.get('items'))
+    items = order_data['items'] if is_cart else [order_data]
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return 'items must be a non-empty list of objects', None, None
+    
+    missing_fields = [field for field in REQUIRED_CUSTOMER_FIELDS if not order_data.get(field)]
+    for index, item in enumerate(items):
+        missing_fields += [
+            f'items[{index}].{field}' if is_cart else field
+            for field in REQUIRED_ITEM_FIELDS if not item.get(field)
+        ]
+    if missing_fields:
+        return f"Missing required field(s): {', '.join(missing_fields)}", None, None
+    
+    total_in_paise = 0
+    for item in items:
+        try:
+            quantity = int(item['quantity'])
+            price = Decimal(str(item['price']))
+        except (TypeError, ValueError, ArithmeticError):
+            return 'Item quantity and price must be numbers', None, None
+        if quantity <= 0 or not price.is_finite() or not 0 < price <= MAX_AMOUNT_IN_PAISE / 100:
+            return 'Item quantity and price must be positive', None, None
+        total_in_paise += int((price * quantity * 100).to_integral_value(rounding=ROUND_HALF_UP))
+    
+    return None, items, total_in_paise
 
 
 @api_view(['POST'])
@@ -29,19 +170,12 @@ def create_razorpay_order(request):
     }
     """
     try:
-        # Get Razorpay credentials from environment
-        razorpay_key_id = config('RAZORPAY_KEY_ID', default=None)
-        razorpay_key_secret = config('RAZORPAY_KEY_SECRET', default=None)
-        
-        if not all([razorpay_key_id, razorpay_key_secret]):
+        if RAZORPAY_CLIENT is None:
             return Response(
                 {'error': 'Razorpay credentials not configured. Please contact administrator.'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        # Initialize Razorpay client
-        client = razorpay.Client(auth=(razorpay_key_id, razorpay_key_secret))
-        
         # Get amount from request (in INR)
         amount = request.data.get('amount')
         currency = request.data.get('currency', 'INR')
@@ -52,11 +186,38 @@ def create_razorpay_order(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Convert amount to paise (Razorpay expects amount in smallest currency unit)
-        amount_in_paise = int(float(amount) * 100)
+        # Parse as Decimal so e.g. 399.99 doesn't become 39998 paise via float error
+        try:
+            amount = Decimal(str(amount))
+        except InvalidOperation:
+            amount = None
+        
+        if amount is None or not amount.is_finite():
+            return Response(
+                {'error': 'Amount must be a number'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Range-check before scaling: Decimal overflows on e.g. 1e999999 * 100
+        if not 0 < amount <= MAX_AMOUNT_IN_PAISE / 100:
+            return Response(
+                {'error': f'Amount must be between 0.01 and {MAX_AMOUNT_IN_PAISE // 100}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Convert amount to paise (Razorpay expects amount in smallest currency
+        # unit). Rounding absorbs float noise from client-side price * quantity,
+        # e.g. 1199.9699999999998 -> 119997.
+        amount_in_paise = int((amount * 100).to_integral_value(rounding=ROUND_HALF_UP))
+        
+        if amount_in_paise <= 0:
+            return Response(
+                {'error': f'Amount must be between 0.01 and {MAX_AMOUNT_IN_PAISE // 100}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
         # Create Razorpay order
-        razorpay_order = client.order.create({
+        razorpay_order = RAZORPAY_CLIENT.order.create({
             'amount': amount_in_paise,
             'currency': currency,
             'payment_capture': 1  # Auto capture payment
@@ -68,13 +229,11 @@ def create_razorpay_order(request):
             'order_id': razorpay_order['id'],
             'amount': razorpay_order['amount'],
             'currency': razorpay_order['currency'],
-            'razorpay_key_id': razorpay_key_id  # Need this for frontend
+            'razorpay_key_id': RAZORPAY_KEY_ID  # Need this for frontend
         }, status=status.HTTP_201_CREATED)
         
     except Exception as e:
-        print(f"Error creating Razorpay order: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("create_razorpay_order failed")
         return Response(
             {'error': f'Failed to create payment order: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -96,6 +255,9 @@ def verify_payment(request):
             "size": "M",
             "quantity": 1,
             "price": 399.00,
+            "items": [  # optional, for multi-item carts; replaces the four fields above
+                {"product_title": "Polo T-shirt", "size": "M", "quantity": 1, "price": 399.00}
+            ],
             "full_name": "John Doe",
             "mobile": "9876543210",
             "country_code": "+91",
@@ -122,91 +284,97 @@ def verify_payment(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Get Razorpay credentials
-        razorpay_key_secret = config('RAZORPAY_KEY_SECRET', default=None)
-        
-        if not razorpay_key_secret:
+        if RAZORPAY_CLIENT is None:
             return Response(
                 {'error': 'Razorpay credentials not configured'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        # Verify signature
-        generated_signature = hmac.new(
-            razorpay_key_secret.encode(),
-            f"{razorpay_order_id}|{razorpay_payment_id}".encode(),
-            hashlib.sha256
-        ).hexdigest()
-        
-        if generated_signature != razorpay_signature:
+        # Verify signature (the SDK does a constant-time HMAC-SHA256 compare)
+        try:
+            RAZORPAY_CLIENT.utility.verify_payment_signature({
+                'razorpay_order_id': razorpay_order_id,
+                'razorpay_payment_id': razorpay_payment_id,
+                'razorpay_signature': razorpay_signature,
+            })
+        except (razorpay.errors.SignatureVerificationError, TypeError):
+            # TypeError: compare_digest rejects non-ASCII signature strings
             return Response(
                 {'error': 'Payment verification failed. Invalid signature.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Payment verified successfully, create order
-        # Generate unique order ID
-        order_id = f"ORD{uuid.uuid4().hex[:8].upper()}"
+        # Payment verified successfully, create orders. A cart may send several
+        # line items under "items"; customer and address details are shared.
+        error, items, total_in_paise = _validate_order_data(order_data)
+        if error:
+            logger.warning("verify_payment: rejected cart for %s: %s", razorpay_order_id, error)
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Calculate total amount
-        total_amount = float(order_data['price']) * int(order_data['quantity'])
+        # The cart comes from the client; make sure it is what was actually charged
+        charged_in_paise = RAZORPAY_CLIENT.order.fetch(razorpay_order_id)['amount']
+        if total_in_paise != charged_in_paise:
+            logger.warning(
+                "verify_payment: cart total %s paise != charged %s paise for %s",
+                total_in_paise, charged_in_paise, razorpay_order_id
+            )
+            return Response(
+                {'error': 'Order items do not match the amount paid'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Create order in database
-        order = Order.objects.create(
-            order_id=order_id,
-            product_title=order_data['product_title'],
-            size=order_data['size'],
-            quantity=order_data['quantity'],
-            price=order_data['price'],
-            total_amount=total_amount,
-            full_name=order_data['full_name'],
-            mobile=order_data['mobile'],
-            country_code=order_data.get('country_code', '+91'),
-            house_flat_no=order_data['house_flat_no'],
-            street_locality=order_data['street_locality'],
-            city=order_data['city'],
-            state=order_data['state'],
-            pin_code=order_data['pin_code'],
-            payment_mode='ONLINE',
-            payment_status='COMPLETED',
-            razorpay_order_id=razorpay_order_id,
-            razorpay_payment_id=razorpay_payment_id,
-            razorpay_signature=razorpay_signature,
-            order_status='CONFIRMED'
-        )
+        orders = [
+            Order(
+                order_id=generate_order_id(),
+                product_title=item['product_title'],
+                size=item['size'],
+                quantity=item['quantity'],
+                price=item['price'],
+                total_amount=float(item['price']) * int(item['quantity']),
+                full_name=order_data['full_name'],
+                mobile=order_data['mobile'],
+                country_code=order_data.get('country_code', '+91'),
+                house_flat_no=order_data['house_flat_no'],
+                street_locality=order_data['street_locality'],
+                city=order_data['city'],
+                state=order_data['state'],
+                pin_code=order_data['pin_code'],
+                payment_mode='ONLINE',
+                payment_status='COMPLETED',
+                razorpay_order_id=razorpay_order_id,
+                razorpay_payment_id=razorpay_payment_id,
+                razorpay_signature=razorpay_signature,
+                order_status='CONFIRMED'
+            )
+            for item in items
+        ]
         
-        # Send WhatsApp notification
-        try:
-            print(f"\n{'='*60}")
-            print(f"🔔 Attempting WhatsApp notification for Order: {order_id}")
-            print(f"{'='*60}")
-            whatsapp_message_sid = send_whatsapp_notification(order)
-            order.whatsapp_message_sid = whatsapp_message_sid
-            order.save()
-            print(f"✅ WhatsApp notification successful!")
-            print(f"{'='*60}\n")
-        except Exception as e:
-            error_msg = str(e)
-            print(f"\n{'='*60}")
-            print(f"❌ WhatsApp notification failed (non-critical)")
-            print(f"   Order ID: {order_id}")
-            print(f"   Error: {error_msg}")
-            print(f"{'='*60}\n")
-            import traceback
-            traceback.print_exc()
+        # Insert every line item and schedule the notifications in one
+        # transaction; the WhatsApp sends only start once the commit succeeds
+        with transaction.atomic():
+            if len(orders) == 1:
+                # Single-item checkout: plain INSERT, no bulk batching
+                orders[0].save(force_insert=True)
+            else:
+                Order.objects.bulk_create(orders, batch_size=500)
+            
+            # Send WhatsApp notifications in the background; the customer
+            # shouldn't wait on Twilio after paying
+            for order in orders:
+                queue_whatsapp_notification(order)
         
+        order = orders[0]
         return Response({
             'success': True,
             'message': 'Payment verified and order placed successfully!',
-            'order_id': order_id,
+            'order_id': order.order_id,
+            'order_ids': [item_order.order_id for item_order in orders],
             'order_status': order.order_status,
             'payment_status': order.payment_status
         }, status=status.HTTP_201_CREATED)
         
     except Exception as e:
-        print(f"Error verifying payment: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("verify_payment failed")
         return Response(
             {'error': f'Failed to verify payment: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -215,87 +383,93 @@ def verify_payment(request):
 
 def send_whatsapp_notification(order):
     """Send WhatsApp notification for order with comprehensive error logging."""
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # Get Twilio credentials with detailed logging
-    account_sid = config('TWILIO_ACCOUNT_SID', default=None)
-    auth_token = config('TWILIO_AUTH_TOKEN', default=None)
-    from_whatsapp = config('TWILIO_WHATSAPP_FROM', default=None)
-    to_whatsapp = config('TWILIO_WHATSAPP_TO', default=None)
-    
     # Log which credentials are missing (without exposing values)
     missing_creds = []
-    if not account_sid:
+    if not TWILIO_ACCOUNT_SID:
         missing_creds.append('TWILIO_ACCOUNT_SID')
-    if not auth_token:
+    if not TWILIO_AUTH_TOKEN:
         missing_creds.append('TWILIO_AUTH_TOKEN')
-    if not from_whatsapp:
+    if not TWILIO_WHATSAPP_FROM:
         missing_creds.append('TWILIO_WHATSAPP_FROM')
-    if not to_whatsapp:
+    if not TWILIO_WHATSAPP_TO:
         missing_creds.append('TWILIO_WHATSAPP_TO')
     
     if missing_creds:
         error_msg = f"Twilio credentials not configured. Missing: {', '.join(missing_creds)}"
         logger.error(error_msg)
-        print(f"❌ WhatsApp ERROR: {error_msg}")
         raise Exception(error_msg)
     
-    logger.info(f"✅ All Twilio credentials found. Attempting to send WhatsApp for order {order.order_id}")
-    print(f"🔄 Sending WhatsApp notification for order {order.order_id}")
-    print(f"   From: {from_whatsapp}")
-    print(f"   To: {to_whatsapp}")
+    logger.info(
+        "Sending WhatsApp notification for order %s from %s to %s",
+        order.order_id, TWILIO_WHATSAPP_FROM, TWILIO_WHATSAPP_TO
+    )
     
     # Format WhatsApp message
-    payment_info = "💳 Payment: Online (PAID)" if order.payment_mode == 'ONLINE' else "💵 Payment: Cash on Delivery"
+    payment_info = PAYMENT_INFO_ONLINE if order.payment_mode == 'ONLINE' else PAYMENT_INFO_COD
     
-    message = f"""🛍️ *New Order Received!*
-
-📦 *Order Details:*
-• Order ID: {order.order_id}
-• Product: {order.product_title}
-• Size: {order.size}
-• Quantity: {order.quantity}
-• Total: ₹{order.total_amount:.2f}
-{payment_info}
-
-👤 *Customer Details:*
-• Name: {order.full_name}
-• Mobile: {order.country_code} {order.mobile}
-
-📍 *Delivery Address:*
-• House/Flat: {order.house_flat_no}
-• Street: {order.street_locality}
-• City: {order.city}
-• State: {order.state}
-• PIN Code: {order.pin_code}
-
-✅ Please process this order!"""
+    message = WHATSAPP_TEMPLATE.format_map({
+        'order_id': order.order_id,
+        'product_title': order.product_title,
+        'size': order.size,
+        'quantity': order.quantity,
+        'total_amount': order.total_amount,
+        'payment_info': payment_info,
+        'full_name': order.full_name,
+        'country_code': order.country_code,
+        'mobile': order.mobile,
+        'house_flat_no': order.house_flat_no,
+        'street_locality': order.street_locality,
+        'city': order.city,
+        'state': order.state,
+        'pin_code': order.pin_code,
+    })
     
     try:
-        # Initialize Twilio client and send message
-        client = Client(account_sid, auth_token)
-        logger.info(f"Twilio client initialized. Sending message...")
-        print(f"📤 Twilio client initialized successfully")
-        
-        message_response = client.messages.create(
+        # Send message through the shared Twilio client
+        message_response = TWILIO_CLIENT.messages.create(
             body=message,
-            from_=from_whatsapp,
-            to=to_whatsapp
+            from_=TWILIO_WHATSAPP_FROM,
+            to=TWILIO_WHATSAPP_TO
         )
         
-        logger.info(f"✅ WhatsApp Message Sent Successfully: SID={message_response.sid}, Status={message_response.status}")
-        print(f"✅ WhatsApp Message Sent: SID={message_response.sid}")
-        print(f"   Status: {message_response.status}")
+        logger.info(
+            "WhatsApp message sent: SID=%s, Status=%s",
+            message_response.sid, message_response.status
+        )
         
         return message_response.sid
         
     except Exception as e:
         error_details = str(e)
-        logger.error(f"❌ Twilio API Error: {error_details}")
-        print(f"❌ WhatsApp Send Failed!")
-        print(f"   Error Type: {type(e).__name__}")
-        print(f"   Error Message: {error_details}")
+        logger.error("Twilio API error (%s): %s", type(e).__name__, error_details)
         
         # Re-raise with more context
         raise Exception(f"Twilio WhatsApp Error: {error_details}")
+
+
+def queue_whatsapp_notification(order):
+    """Send the WhatsApp notification for an order once it has been committed."""
+    if not WHATSAPP_ENABLED:
+        logger.debug("WhatsApp notifications disabled; skipping order %s", order.order_id)
+        return
+    
+    order_pk = order.pk
+    transaction.on_commit(
+        lambda: WHATSAPP_EXECUTOR.submit(deliver_whatsapp_notification, order_pk)
+    )
+
+
+def deliver_whatsapp_notification(order_pk):
+    """Background task: send the WhatsApp notification and store its message SID."""
+    try:
+        order = Order.objects.get(pk=order_pk)
+        logger.info("Attempting WhatsApp notification for order %s", order.order_id)
+        whatsapp_message_sid = send_whatsapp_notification(order)
+        # Narrow UPDATE so Order.save() logic isn't re-run for one column
+        Order.objects.filter(pk=order_pk).update(whatsapp_message_sid=whatsapp_message_sid)
+        logger.info("WhatsApp notification sent for order %s", order.order_id)
+    except Exception:
+        logger.exception("WhatsApp notification failed for order pk=%s (non-critical)", order_pk)
+    finally:
+        # Worker threads open their own DB connection; don't leave it dangling
+        connection.close()
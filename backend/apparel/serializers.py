@@ -1,5 +1,11 @@
 from rest_framework import serializers
 from .models import ApparelProduct
+import os
+
+
+SIZE_CODES = tuple(code for code, _ in ApparelProduct.SIZE_CHOICES)
+VALID_SIZES = frozenset(SIZE_CODES)
+VALID_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp'})
 
 
 class ApparelProductSerializer(serializers.ModelSerializer):
@@ -10,8 +16,8 @@ class ApparelProductSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     category_display = serializers.CharField(source='get_category_display', read_only=True)
     
-    # Make image URL absolute
-    image_url = serializers.SerializerMethodField()
+    # Absolute image URL (DRF builds it from the request in the context)
+    image_url = serializers.ImageField(source='image', use_url=True, read_only=True)
     
     class Meta:
         model = ApparelProduct
@@ -35,26 +41,16 @@ class ApparelProductSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
     
-    def get_image_url(self, obj):
-        """Get absolute URL for image."""
-        request = self.context.get('request')
-        if obj.image and hasattr(obj.image, 'url'):
-            if request is not None:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
-    
     def validate_sizes(self, value):
         """Validate sizes field."""
         if not isinstance(value, list):
             raise serializers.ValidationError("Sizes must be a list.")
         
-        valid_sizes = ['S', 'M', 'L', 'XL', 'XXL']
-        for size in value:
-            if size not in valid_sizes:
-                raise serializers.ValidationError(
-                    f"Invalid size '{size}'. Must be one of: {', '.join(valid_sizes)}"
-                )
+        invalid = [size for size in value if not (isinstance(size, str) and size in VALID_SIZES)]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Invalid size(s): {', '.join(map(str, invalid))}. Must be one of: {', '.join(SIZE_CODES)}"
+            )
         
         return value
     
@@ -72,11 +68,32 @@ class ApparelProductSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Image file size must be less than 5MB.")
             
             # Check file extension
-            valid_extensions = ['.jpg', '.jpeg', '.png', '.webp']
-            ext = value.name.lower().split('.')[-1]
-            if f'.{ext}' not in valid_extensions:
+            ext = os.path.splitext(value.name)[1].lower()
+            if ext not in VALID_IMAGE_EXTENSIONS:
                 raise serializers.ValidationError(
-                    f"Invalid file type. Allowed types: {', '.join(valid_extensions)}"
+                    f"Invalid file type. Allowed types: {', '.join(sorted(VALID_IMAGE_EXTENSIONS))}"
                 )
         
         return value
+
+
+class ApparelProductListSerializer(ApparelProductSerializer):
+    """Serializer for product lists; omits the long text fields."""
+    
+    class Meta(ApparelProductSerializer.Meta):
+        fields = [
+            'id',
+            'title',
+            'image',
+            'image_url',
+            'category',
+            'category_display',
+            'sizes',
+            'mrp_price',
+            'status',
+            'status_display',
+            'status_color',
+            'is_active',
+            'created_at',
+            'updated_at',
+        ]
@@ -1,8 +1,37 @@
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import ApparelProduct
-from .serializers import ApparelProductSerializer
+from .serializers import ApparelProductSerializer, ApparelProductListSerializer
+
+
+# Columns needed by ApparelProductListSerializer
+PRODUCT_LIST_FIELDS = (
+    'id',
+    'title',
+    'image',
+    'category',
+    'sizes',
+    'mrp_price',
+    'status',
+    'is_active',
+    'created_at',
+    'updated_at',
+)
+
+# Choice lists only change on deploy, so build the payloads once
+CATEGORIES_PAYLOAD = [
+    {'value': value, 'label': label}
+    for value, label in ApparelProduct.CATEGORY_CHOICES
+]
+SIZES_PAYLOAD = [
+    {'value': value, 'label': label}
+    for value, label in ApparelProduct.SIZE_CHOICES
+]
+
+choices_cache = method_decorator(cache_control(max_age=86400, public=True))
 
 
 class ApparelProductViewSet(viewsets.ModelViewSet):
@@ -33,8 +62,18 @@ class ApparelProductViewSet(viewsets.ModelViewSet):
         if category and category.upper() != 'ALL':
             queryset = queryset.filter(category=category.upper())
         
+        # Lists skip description/whatsapp_message; detail views load everything
+        if self.action == 'list':
+            queryset = queryset.only(*PRODUCT_LIST_FIELDS)
+        
         return queryset
     
+    def get_serializer_class(self):
+        """Use the lighter serializer for list responses."""
+        if self.action == 'list':
+            return ApparelProductListSerializer
+        return ApparelProductSerializer
+    
     def create(self, request, *args, **kwargs):
         """Create a new apparel product."""
         serializer = self.get_serializer(data=request.data)
@@ -67,19 +106,13 @@ class ApparelProductViewSet(viewsets.ModelViewSet):
         )
     
     @action(detail=False, methods=['get'])
+    @choices_cache
     def categories(self, request):
         """Get list of all available categories."""
-        categories = [
-            {'value': choice[0], 'label': choice[1]}
-            for choice in ApparelProduct.CATEGORY_CHOICES
-        ]
-        return Response(categories)
+        return Response(CATEGORIES_PAYLOAD)
     
     @action(detail=False, methods=['get'])
+    @choices_cache
     def sizes(self, request):
         """Get list of all available sizes."""
-        sizes = [
-            {'value': choice[0], 'label': choice[1]}
-            for choice in ApparelProduct.SIZE_CHOICES
-        ]
-        return Response(sizes)
+        return Response(SIZES_PAYLOAD)
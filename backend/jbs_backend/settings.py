@@ -4,7 +4,6 @@ Django settings for jbs_backend project.
 
 from pathlib import Path
 from decouple import config
-import os
 import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -12,17 +11,20 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = config('SECRET_KEY', default='django-insecure-change-this-in-production-12345')
+# No default: startup fails if SECRET_KEY is unset (copy .env.example locally)
+SECRET_KEY = config('SECRET_KEY')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = config('DEBUG', default=True, cast=bool)
+# Off unless explicitly enabled, so a missing env var never means debug mode
+DEBUG = config('DEBUG', default=False, cast=bool)
 
-ALLOWED_HOSTS = ['localhost', '127.0.0.1', '*']
+# Development accepts any host; production narrows this in the CORS block below
+ALLOWED_HOSTS = ('*',)
 
 
 # Application definition
 
-INSTALLED_APPS = [
+INSTALLED_APPS = (
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -38,11 +40,14 @@ INSTALLED_APPS = [
     
     # Local apps
     'apparel',
-]
+)
 
 MIDDLEWARE = [
+    'apparel.middleware.HealthFastPathMiddleware',  # Must stay first
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # WhiteNoise for static files
+    # Directly after the security middleware so static files get its headers
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.middleware.gzip.GZipMiddleware',  # Compress API responses
     'corsheaders.middleware.CorsMiddleware',  # CORS must be before CommonMiddleware
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -52,6 +57,26 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# API_ONLY deployments serve just the DRF endpoints: no Django admin, so the
+# session/CSRF/messages machinery the admin needs is left out as well.
+API_ONLY = config('API_ONLY', default=False, cast=bool)
+
+if API_ONLY:
+    ADMIN_ONLY_APPS = (
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+    )
+    ADMIN_ONLY_MIDDLEWARE = (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )
+    INSTALLED_APPS = tuple(app for app in INSTALLED_APPS if app not in ADMIN_ONLY_APPS)
+    MIDDLEWARE = [m for m in MIDDLEWARE if m not in ADMIN_ONLY_MIDDLEWARE]
+
 ROOT_URLCONF = 'jbs_backend.urls'
 
 TEMPLATES = [
@@ -80,9 +105,17 @@ WSGI_APPLICATION = 'jbs_backend.wsgi.application'
 # Use DATABASE_URL if available (Render provides this), otherwise use individual settings
 DATABASE_URL = config('DATABASE_URL', default=None)
 
+# Keep connections open between requests (re-checked before reuse) instead of
+# reconnecting to Postgres for every request
+DB_CONN_MAX_AGE = 600
+
 if DATABASE_URL:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL)
+        'default': dj_database_url.parse(
+            DATABASE_URL,
+            conn_max_age=DB_CONN_MAX_AGE,
+            conn_health_checks=True,
+        )
     }
 else:
     DATABASES = {
@@ -93,8 +126,26 @@ else:
             'PASSWORD': config('DATABASE_PASSWORD', default='postgres'),
             'HOST': config('DATABASE_HOST', default='localhost'),
             'PORT': config('DATABASE_PORT', default='5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+        }
+    }
+
+
+# Cache
+# A shared Redis cache when REDIS_URL is set (e.g. a Render Key Value
+# instance); otherwise Django's per-process local-memory cache.
+REDIS_URL = config('REDIS_URL', default=None)
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
         }
     }
+    # Admin sessions are read from Redis, with the database as the fallback
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 
 
 # Password validation
@@ -123,7 +174,8 @@ LANGUAGE_CODE = 'en-us'
 
 TIME_ZONE = 'Asia/Kolkata'
 
-USE_I18N = True
+# No translated strings; everything is served in LANGUAGE_CODE
+USE_I18N = False
 
 USE_TZ = True
 
@@ -132,14 +184,20 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = '/static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 
-# WhiteNoise configuration for serving static files
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# WhiteNoise configuration for serving static files. Development skips
+# hashing/compression and serves straight from the app finders.
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+    else 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+)
+WHITENOISE_AUTOREFRESH = DEBUG
+WHITENOISE_USE_FINDERS = DEBUG
 
 # Media files (Uploaded images)
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+MEDIA_ROOT = BASE_DIR / 'media'
 
 # Cloudinary Configuration
 CLOUDINARY_STORAGE = {
@@ -160,37 +218,44 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CORS Settings
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:5173')
 
-if DEBUG:
-    # Development CORS settings
-    CORS_ALLOWED_ORIGINS = [
-        FRONTEND_URL,
-        'http://localhost:3000',
-        'http://127.0.0.1:5173',
-        'http://127.0.0.1:3000',
-    ]
-else:
-    # Production CORS settings
-    CORS_ALLOWED_ORIGINS = [
-        FRONTEND_URL,
-    ]
+FRONTEND_ORIGINS = (FRONTEND_URL,)
+DEV_FRONTEND_ORIGINS = FRONTEND_ORIGINS + (
+    'http://localhost:3000',
+    'http://127.0.0.1:5173',
+    'http://127.0.0.1:3000',
+)
+
+CORS_ALLOWED_ORIGINS = DEV_FRONTEND_ORIGINS if DEBUG else FRONTEND_ORIGINS
+CSRF_TRUSTED_ORIGINS = FRONTEND_ORIGINS
+
+if not DEBUG:
     # Trust the Render domain
-    ALLOWED_HOSTS = [
+    ALLOWED_HOSTS = (
         '.onrender.com',  # Allow all Render subdomains
         'localhost',
         '127.0.0.1',
-    ]
+    )
     # Security settings for production
-    CSRF_TRUSTED_ORIGINS = [FRONTEND_URL]
     SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Only the API is called cross-origin; skip CORS handling for admin/static/media
+CORS_URLS_REGEX = r'^/api/.*$'
+
 # Django REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # The browsable API is only useful while developing
+    'DEFAULT_RENDERER_CLASSES': (
+        ('rest_framework.renderers.JSONRenderer',
+         'rest_framework.renderers.BrowsableAPIRenderer')
+        if DEBUG else
+        ('rest_framework.renderers.JSONRenderer',)
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'apparel.pagination.NewestFirstCursorPagination',
     'PAGE_SIZE': 20,
 }
 
@@ -213,5 +278,10 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'apparel': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
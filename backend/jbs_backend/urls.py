@@ -8,11 +8,14 @@ from django.conf.urls.static import static
 from django.views.static import serve
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include('apparel.urls')),
     re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
 ]
 
+# The admin app isn't installed on API-only deployments
+if not settings.API_ONLY:
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
 # Serve media files in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)